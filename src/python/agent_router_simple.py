@@ -7,23 +7,209 @@ This version uses simple CLI input/output instead of curses TUI to avoid
 terminal compatibility issues while providing the same functionality.
 """
 
+import functools
 import yaml
-import json
 import subprocess
 import sys
 import os
+import shutil
+import signal
+import re
 import textwrap
 import random
 import string
 import readline  # For better input editing
 import threading
 import time
+import traceback
 from datetime import datetime
+from itertools import takewhile
 from typing import Dict, List, Any, Tuple
 
 # Global default timeout for agent responses (in seconds)
 DEFAULT_AGENT_TIMEOUT = 60
 
+# libyaml-backed safe loader/dumper when PyYAML was built with it, pure-Python otherwise
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+# Pastes with more consecutive blank lines than this ask for confirmation
+PASTE_BLANK_LINES_THRESHOLD = 5
+
+# Template describing each specialized agent in the router prompt
+AGENT_PROMPT_TEMPLATE = (
+    "- ID: {id}\n"
+    "  Name: {name}\n"
+    "  Description/Role: {description}\n"
+    "  Framework: {framework}\n"
+    "  Agent Command: {agent_name}\n"
+    "  Model: {model}"
+)
+
+# A prompts file we can append to: an optional comment preamble, then a top-level 'prompts:'
+# block list whose items start at column 0 (the layout yaml.dump produces)
+PROMPTS_FILE_HEADER = re.compile(r'(?:[ \t]*(?:#[^\n]*)?\n)*prompts:[ \t]*(?:\n|\Z)(?:[ \t]*(?:#[^\n]*)?\n)*(?=- |\Z)')
+# Any other top-level content (keys, flow lists, document markers) forces a full rewrite
+PROMPTS_FILE_FOREIGN_LINE = re.compile(r'^(?![ \t]|- |#)[^\n]', re.MULTILINE)
+
+# Reusable wrappers for displaying generated prompts (avoids building a TextWrapper per line)
+PROMPT_LINE_WRAPPER = textwrap.TextWrapper(width=66, initial_indent="   ", subsequent_indent="   ")
+QUESTION_WRAPPER = textwrap.TextWrapper(width=66, initial_indent="   ", subsequent_indent="      ")
+
+# Accepted answers for interactive prompts
+YES_ANSWERS = frozenset({'y', 'yes'})
+YES_OR_DEFAULT_ANSWERS = frozenset({'y', 'yes', ''})
+NO_ANSWERS = frozenset({'n', 'no'})
+SCOPE_SINGLE_ANSWERS = frozenset({'s', 'single'})
+SCOPE_UNIT_ANSWERS = frozenset({'u', 'unit', 'per-unit'})
+TOGGLE_PROMPT_COMMANDS = frozenset({'/toggle-prompt', '/tp'})
+
+# Feedback answers in display_results mapped to the value it returns
+FEEDBACK_CHOICES = {
+    'y': True, 'yes': True,                         # Accept prompt
+    'n': 'modify', 'no': 'modify',                  # Re-consult Solution Strategist
+    'm': False, 'modify': False, 'manual': False,   # Manual context only, don't re-consult
+}
+
+# Router (Solution Strategist) prompt; everything after {user_problem} is static per scope/agents config
+ROUTER_PROMPT_TEMPLATE = """CRITICAL: You are ONLY a prompt generator. You must NOT generate any solutions, code, or content. Your ONLY job is to analyze the problem and generate an optimized prompt for another agent.
+
+The user has a problem with the current project:
+"{user_problem}"
+
+EXECUTION SCOPE: {execution_scope}
+{scope_instructions}
+
+Evaluate using the framework "{framework}" (Reason + Act approach).
+
+I have several agents and one of them might be able to generate the solution:
+
+{agents_info}
+
+IMPORTANT: Your role is EXCLUSIVELY to:
+1. Recommend which agent should handle this task
+2. Ask clarifying questions if needed
+3. Generate an optimized prompt for that agent
+4. You must NOT provide any solutions yourself
+
+You must indicate in a structured YAML format using multiline syntax:
+- agent_id: ID of the recommended agent
+- questions: list of questions you need answered to complete the framework (if any)
+- draft_prompt: >-
+    A complete, optimized prompt for the selected agent.
+    CRITICAL: The prompt MUST start with the agent's role/persona definition.
+    Use the agent's description as their persona, then include their framework and the task.
+    Use YAML multiline format (>-) to avoid escaping quotes and special characters.
+    
+    MANDATORY FORMAT:
+    draft_prompt: >-
+      You are [AGENT_DESCRIPTION_HERE].
+      
+      Framework: [AGENT_FRAMEWORK_HERE]
+      
+      Your task is to help solve the following problem:
+      [USER_PROBLEM_DESCRIPTION]
+      
+      [Additional instructions based on the framework]
+      
+    Example:
+    draft_prompt: >-
+      You are an expert software engineer specializing in modern web development with React, Vue, and Node.js.
+      
+      Framework: Component-Based Development
+      
+      Your task is to help solve the following problem:
+      Create a responsive navigation component with mobile hamburger menu
+      
+      Please provide a complete solution following component-based architecture principles.
+- complete: true/false indicating if the prompt is complete or if questions need to be answered
+
+Wrap your YAML response between ```yaml and ``` markers. Do not include any other text outside these markers.
+"""
+ROUTER_PROMPT_HEAD, _, ROUTER_PROMPT_TAIL = ROUTER_PROMPT_TEMPLATE.partition("{user_problem}")
+
+@functools.lru_cache(maxsize=4)
+def build_router_prompt_tail(execution_scope: str, scope_instructions: str, framework: str, agents_info: str) -> str:
+    """Render the static part of the router prompt that follows the user problem"""
+    return ROUTER_PROMPT_TAIL.format(
+        execution_scope=execution_scope.upper(),
+        scope_instructions=scope_instructions,
+        framework=framework,
+        agents_info=agents_info,
+    )
+
+@functools.lru_cache(maxsize=32)
+def build_agent_command_prefix(agent_name: str, model: str, fallback_model: str = None,
+                               stdin_prompt: bool = False) -> Tuple[Tuple[str, ...], str]:
+    """Build an agent CLI command up to the prompt argument, plus its display string"""
+    if agent_name == 'claude' and fallback_model:
+        # For Claude: pass both primary and fallback models in single command
+        prefix = ("claude", "--model", model, "--fallback-model", fallback_model, "-a")
+    else:
+        # For other agents (gemini): use traditional single model approach
+        prefix = (agent_name, "-m", model, "-a")
+    if stdin_prompt:
+        # Claude's -p is print mode and reads the prompt from stdin; gemini reads stdin when -p is absent
+        if agent_name == 'claude':
+            prefix += ("-p",)
+        return prefix, " ".join(prefix) + ' < <stdin>'
+    return prefix, " ".join(prefix) + ' -p "[PROMPT_CONTENT]"'
+
+# First ```yaml fenced block in an agent's output (up to the closing fence, or the end if unclosed)
+YAML_BLOCK = re.compile(r'^[ \t]*```yaml.*?(?:^[ \t]*```[^\n]*|\Z)', re.MULTILINE | re.DOTALL)
+
+def extract_yaml_block(output: str) -> str:
+    """Return the fenced YAML block from agent output, dropping CLI chatter around it"""
+    match = YAML_BLOCK.search(output)
+    return match.group(0) if match else ""
+
+def kill_process_group(process: subprocess.Popen, grace_period: int = 5):
+    """Terminate an agent CLI's process group, escalating to SIGKILL if it ignores SIGTERM"""
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+        process.communicate(timeout=grace_period)
+    except ProcessLookupError:
+        process.communicate()
+    except subprocess.TimeoutExpired:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        process.communicate()
+
+def run_agent_command(cmd: List[str], timeout: int, input_bytes: bytes = None) -> subprocess.CompletedProcess:
+    """Run an agent CLI, collecting its output as bytes and decoding it once as UTF-8"""
+    stdin = subprocess.PIPE if input_bytes is not None else None
+    # Own session so a timeout can take down helpers the CLI spawned (node, python), not just the CLI
+    with subprocess.Popen(cmd, stdin=stdin, stdout=subprocess.PIPE, stderr=subprocess.PIPE, bufsize=65536,
+                          start_new_session=True) as process:
+        try:
+            stdout, stderr = process.communicate(input=input_bytes, timeout=timeout)
+        except (subprocess.TimeoutExpired, KeyboardInterrupt):
+            # The CLI no longer shares our process group, so Ctrl+C has to be forwarded by hand too
+            kill_process_group(process)
+            raise
+    return subprocess.CompletedProcess(
+        cmd, process.returncode,
+        stdout.decode('utf-8', errors='replace'),
+        stderr.decode('utf-8', errors='replace'),
+    )
+
+def format_elapsed(seconds: int) -> str:
+    """Format whole seconds as '1m 05s' or '05s' for the waiting counter and response times"""
+    minutes, seconds = divmod(seconds, 60)
+    return f"{minutes}m {seconds:02d}s" if minutes > 0 else f"{seconds:02d}s"
+
+# Matches traceback lines that come from our code (not system/library code)
+OUR_TRACEBACK_LINE = re.compile(r'agent_router|learn-cloud').search
+
+def print_our_traceback(max_lines: int = 6):
+    """Print the last traceback lines that belong to our code"""
+    our_code_lines = [line for line in traceback.format_exc().split('\n') if OUR_TRACEBACK_LINE(line)]
+    for line in our_code_lines[-max_lines:]:
+        if line.strip():
+            print(f"    {line}")
+
 # ANSI color codes for better visual feedback
 class Colors:
     RESET = '\033[0m'
@@ -51,6 +237,22 @@ class Colors:
     BG_WHITE = '\033[47m'
     BG_GRAY = '\033[100m'
 
+# Colored menu option labels, rendered once instead of on every menu display
+ACCEPT_OPTION_LABEL = f"   {Colors.GREEN}y/Y{Colors.RESET} = Accept this prompt (save and use)"
+REFINE_OPTION_LABEL = f"   {Colors.YELLOW}n/N{Colors.RESET} = Need refinement (re-consult Solution Strategist)"
+MANUAL_OPTION_LABEL = f"   {Colors.RED}m/M{Colors.RESET} = Manual context only (add context without re-consulting)"
+SINGLE_SCOPE_LABEL = f"{Colors.GREEN}s{Colors.RESET} = Single execution (entire project)"
+PER_UNIT_SCOPE_LABEL = f"{Colors.YELLOW}u{Colors.RESET} = Per-unit execution (template with Unit X placeholder)"
+
+# Colored prompts and messages repeated inside input retry loops
+ACCEPT_PASTE_PROMPT = f"{Colors.CYAN}Accept this paste? (y/N): {Colors.RESET}"
+FEEDBACK_CHOICE_PROMPT = f"\n{Colors.CYAN}Your choice (y/n/m): {Colors.RESET}"
+FEEDBACK_CHOICE_ERROR = f"{Colors.RED}❌ Please enter 'y' to accept, 'n' to refine, or 'm' for manual context{Colors.RESET}"
+PROCEED_PROMPT = f"\n{Colors.CYAN}Proceed with this input? (y/n): {Colors.RESET}"
+EXECUTION_SCOPE_PROMPT = f"\n{Colors.CYAN}Execution scope (s/u): {Colors.RESET}"
+EXECUTION_SCOPE_ERROR = f"{Colors.RED}❌ Please enter 's' for single or 'u' for per-unit execution{Colors.RESET}"
+EXITING_MESSAGE = f"\n{Colors.YELLOW}👋 Exiting...{Colors.RESET}"
+
 class AgentRouterCLI:
     def __init__(self, agents_file: str = None):
         self.show_strategist_prompt = False  # Toggle for showing strategist prompt
@@ -71,6 +273,13 @@ class AgentRouterCLI:
             self.prompts_file = os.path.join(agents_dir, "agent_prompts.yaml")
         
         self.agents = self.load_agents()
+        self.agents_by_id = {agent['id']: agent for agent in self.agents}
+        # Agents don't change during a session, so render their router prompt blocks once
+        self.agent_prompt_blocks = [
+            AGENT_PROMPT_TEMPLATE.format_map(agent)
+            for agent in self.agents
+            if agent['id'] != 'SS01'  # Exclude the router itself
+        ]
         
     def generate_prompt_id(self) -> str:
         """Generate a unique 3-5 character alphanumeric ID"""
@@ -82,7 +291,7 @@ class AgentRouterCLI:
         try:
             if os.path.exists(self.prompts_file):
                 with open(self.prompts_file, 'r', encoding='utf-8') as file:
-                    data = yaml.safe_load(file)
+                    data = yaml.load(file, Loader=YAML_LOADER)
                     # Handle case where file is empty or contains only None/null
                     if data is None:
                         return []
@@ -96,6 +305,30 @@ class AgentRouterCLI:
             print(f"⚠️  Warning: Could not load existing prompts: {e}")
             return []
     
+    def append_prompt_entry_to_file(self, prompt_entry: Dict[str, Any]) -> bool:
+        """Append one prompt entry to the prompts file without re-emitting the existing ones.
+        
+        Returns False when the file layout isn't a plain top-level 'prompts:' list, so the
+        caller can fall back to rewriting the whole file.
+        """
+        try:
+            with open(self.prompts_file, 'r', encoding='utf-8') as file:
+                content = file.read()
+        except FileNotFoundError:
+            return False
+        
+        header = PROMPTS_FILE_HEADER.match(content)
+        if not header or PROMPTS_FILE_FOREIGN_LINE.search(content, header.end()):
+            return False
+        
+        entry_yaml = yaml.dump([prompt_entry], Dumper=YAML_DUMPER, default_flow_style=False,
+                               allow_unicode=True, sort_keys=False)
+        with open(self.prompts_file, 'a', encoding='utf-8') as file:
+            if not content.endswith('\n'):
+                file.write('\n')
+            file.write(entry_yaml)
+        return True
+    
     def save_prompt_entry(self, user_problem: str, decision: Dict[str, Any], 
                          satisfied: bool, additional_context: str = "", execution_scope: str = 'single') -> str:
         """Save a new prompt entry to the prompts YAML file"""
@@ -104,7 +337,7 @@ class AgentRouterCLI:
         existing_prompts = self.load_existing_prompts()
         
         # Ensure ID is unique
-        existing_ids = [p.get('id', '') for p in existing_prompts]
+        existing_ids = {p.get('id', '') for p in existing_prompts}
         while prompt_id in existing_ids:
             prompt_id = self.generate_prompt_id()
         
@@ -113,23 +346,33 @@ class AgentRouterCLI:
             print(f"❌ Error: decision is None or empty")
             return ""
         
+        d_get = decision.get
+        
         # Get agent details
-        agent_id = decision.get('agent_id', 'Unknown')
-        selected_agent = next((agent for agent in self.agents if agent['id'] == agent_id), None)
+        agent_id = d_get('agent_id', 'Unknown')
+        selected_agent = self.agents_by_id.get(agent_id)
+        if selected_agent:
+            agent_role = selected_agent['description']
+            agent_name = selected_agent['agent_name']
+            model = selected_agent['model']
+            framework = selected_agent['framework']
+        else:
+            agent_role, agent_name, model, framework = 'Unknown', 'unknown', 'unknown', 'Unknown'
+        model_flag = '--model' if agent_name == 'claude' else '-m'
         
         # Use the prompt as generated by Solution Strategist (should already include role)
         # Prefer the raw format with preserved line breaks for better markdown formatting
-        final_prompt = decision.get('draft_prompt_raw', decision.get('draft_prompt', 'No prompt provided'))
+        final_prompt = self.get_draft_prompt(decision)
         
         now = datetime.now()
         prompt_entry = {
             'id': prompt_id,
             'prompt': final_prompt,
             'agent_id': agent_id,
-            'agent_role': selected_agent['description'] if selected_agent else 'Unknown',
-            'agent_name': selected_agent['agent_name'] if selected_agent else 'unknown',
-            'model': selected_agent['model'] if selected_agent else 'unknown',
-            'framework': selected_agent['framework'] if selected_agent else 'Unknown',
+            'agent_role': agent_role,
+            'agent_name': agent_name,
+            'model': model,
+            'framework': framework,
             'status': 'enabled' if satisfied else 'needs_refinement',
             'created': now.isoformat(),
             'last_execution': None,
@@ -139,10 +382,10 @@ class AgentRouterCLI:
             'additional_context': additional_context if additional_context else None,
             'execution_scope': execution_scope,
             'metadata': {
-                'questions_asked': decision.get('questions', []),
-                'complete': decision.get('complete', False),
+                'questions_asked': d_get('questions', []),
+                'complete': d_get('complete', False),
                 'router_command': f"gemini -m gemini-2.5-pro -a -p \"[PROMPT_CONTENT]\"",
-                'execution_command': f"{selected_agent['agent_name'] if selected_agent else 'unknown'} {'--model' if selected_agent and selected_agent['agent_name'] == 'claude' else '-m'} {selected_agent['model'] if selected_agent else 'unknown'} -a -p \"{{prompt}}\"",
+                'execution_command': f"{agent_name} {model_flag} {model} -a -p \"{{prompt}}\"",
                 'scope_type': execution_scope
             }
         }
@@ -155,9 +398,11 @@ class AgentRouterCLI:
             # Create directory based on prompts file path
             prompts_dir = os.path.dirname(self.prompts_file)
             os.makedirs(prompts_dir, exist_ok=True)
-            with open(self.prompts_file, 'w', encoding='utf-8') as file:
-                yaml.dump({'prompts': existing_prompts}, file, default_flow_style=False, 
-                         allow_unicode=True, sort_keys=False)
+            # Appending only serializes the new entry; rewrite everything if the layout doesn't allow it
+            if not self.append_prompt_entry_to_file(prompt_entry):
+                with open(self.prompts_file, 'w', encoding='utf-8') as file:
+                    yaml.dump({'prompts': existing_prompts}, file, Dumper=YAML_DUMPER, default_flow_style=False, 
+                             allow_unicode=True, sort_keys=False)
             return prompt_id
         except IOError as e:
             print(f"❌ Error saving prompt: {e}")
@@ -167,7 +412,7 @@ class AgentRouterCLI:
         """Load agents configuration from YAML file"""
         try:
             with open(self.agents_file, 'r', encoding='utf-8') as file:
-                data = yaml.safe_load(file)
+                data = yaml.load(file, Loader=YAML_LOADER)
                 return data.get('agents', [])
         except FileNotFoundError:
             print(f"❌ Error: {self.agents_file} not found!")
@@ -178,11 +423,13 @@ class AgentRouterCLI:
     
     def print_header(self):
         """Print the application header"""
-        print("\n" + "="*70)
-        print("🤖 AI Agent Router - Prompt Generator CLI")
-        print("="*70)
-        print("Interactive prompt generation for specialized AI agents")
-        print("="*70)
+        print("\n".join([
+            "\n" + "="*70,
+            "🤖 AI Agent Router - Prompt Generator CLI",
+            "="*70,
+            "Interactive prompt generation for specialized AI agents",
+            "="*70,
+        ]))
     
     def configure_readline_for_input(self):
         """Configure readline for better text input behavior with comprehensive wrapping fix"""
@@ -212,7 +459,6 @@ class AgentRouterCLI:
             readline.set_startup_hook(None)
             
             # Force terminal-aware settings (screenwidth is not supported in all readline versions)
-            import os, shutil
             terminal_width = shutil.get_terminal_size().columns
             if terminal_width > 40:  # Only if we have reasonable width
                 # Note: screenwidth is not universally supported, so we skip it
@@ -227,21 +473,23 @@ class AgentRouterCLI:
             except Exception:
                 print("Warning: Readline configuration failed entirely - text editing may be limited")
     
-    def detect_multiline_paste(self, input_text: str) -> bool:
-        """Detect if input has more than 5 consecutive empty lines (blank lines)"""
-        lines = input_text.split('\n')
+    def get_blank_line_stats(self, input_text: str) -> Tuple[int, int]:
+        """Count blank lines and the longest run of consecutive blank lines in a single pass"""
+        total_empty = 0
         consecutive_empty = 0
         max_consecutive_empty = 0
         
-        for line in lines:
+        for line in input_text.split('\n'):
             if not line.strip():  # Empty or whitespace-only line
+                total_empty += 1
                 consecutive_empty += 1
-                max_consecutive_empty = max(max_consecutive_empty, consecutive_empty)
+                if consecutive_empty > max_consecutive_empty:
+                    max_consecutive_empty = consecutive_empty
             else:
                 consecutive_empty = 0
         
-        return max_consecutive_empty > 5
-
+        return total_empty, max_consecutive_empty
+    
     def get_multiline_input(self, prompt: str) -> str:
         """Get multiline input from user with enhanced editing capabilities and paste detection"""
         # Configure readline for better behavior
@@ -271,33 +519,34 @@ class AgentRouterCLI:
                     readline.set_startup_hook(None)
                     line_prompt = f"{Colors.DIM}[{line_number:2d}] {Colors.RESET}"
                     line = input(line_prompt)
+                    stripped_line = line.strip()
+                    command = stripped_line.lower()
                     
                     # Handle special commands
-                    if line.strip().lower() in ['/toggle-prompt', '/tp']:
+                    if command in TOGGLE_PROMPT_COMMANDS:
                         self.show_strategist_prompt = not self.show_strategist_prompt
                         status = "ON" if self.show_strategist_prompt else "OFF"
                         print(f"{Colors.GREEN}✅ Solution Strategist prompt visibility: {status}{Colors.RESET}")
                         continue
-                    elif line.strip().lower() == '/help':
+                    elif command == '/help':
                         print(f"{Colors.CYAN}📋 Special commands:{Colors.RESET}")
                         print("  /toggle-prompt, /tp - Toggle Solution Strategist prompt visibility")
                         print("  /help - Show this help")
                         continue
                     
                     # Detect multiline paste with too many blank lines
-                    if self.detect_multiline_paste(line):
-                        lines_in_paste = line.split('\n')
-                        empty_lines = sum(1 for l in lines_in_paste if not l.strip())
+                    empty_lines, max_consecutive_empty = self.get_blank_line_stats(line)
+                    if max_consecutive_empty > PASTE_BLANK_LINES_THRESHOLD:
                         print(f"\n{Colors.YELLOW}📋 Paste detected with many blank lines ({empty_lines} empty lines)!{Colors.RESET}")
                         print(f"Content preview: {repr(line[:100])}...")
-                        confirm = input(f"{Colors.CYAN}Accept this paste? (y/N): {Colors.RESET}").strip().lower()
-                        if confirm not in ['y', 'yes']:
+                        confirm = input(ACCEPT_PASTE_PROMPT).strip().lower()
+                        if confirm not in YES_ANSWERS:
                             print(f"{Colors.RED}❌ Paste rejected. Please enter text manually or paste with fewer blank lines.{Colors.RESET}")
                             continue
                         else:
                             print(f"{Colors.GREEN}✅ Paste accepted{Colors.RESET}")
                     
-                    if line.strip():  # Non-empty line
+                    if stripped_line:  # Non-empty line
                         # Split pasted content into lines if it contains newlines
                         if '\n' in line:
                             pasted_lines = line.split('\n')
@@ -328,9 +577,11 @@ class AgentRouterCLI:
         print("🎯 PROMPT GENERATOR RECOMMENDATION")
         print("="*70)
         
+        d_get = decision.get
+        
         # Get selected agent info
-        agent_id = decision.get('agent_id', 'Unknown')
-        selected_agent = next((agent for agent in self.agents if agent['id'] == agent_id), None)
+        agent_id = d_get('agent_id', 'Unknown')
+        selected_agent = self.agents_by_id.get(agent_id)
         
         # Agent info
         if selected_agent:
@@ -340,70 +591,68 @@ class AgentRouterCLI:
             print()
         
         # Draft prompt (show more for agent 01O, truncated for others) - use raw version with preserved line breaks
-        draft_prompt_raw = decision.get('draft_prompt_raw', decision.get('draft_prompt', 'No prompt provided'))
-        print("📝 Generated Prompt:")
-        print("-" * 50)
+        draft_prompt_raw = self.get_draft_prompt(decision)
+        # Build the prompt listing and write it in one go instead of a print per line
+        out = ["📝 Generated Prompt:", "-" * 50]
         
         # Show complete prompt without truncation
-        prompt_lines = draft_prompt_raw.split('\n')
-        for line in prompt_lines:
+        for line in draft_prompt_raw.split('\n'):
             # Handle empty lines (preserve spacing)
             if not line.strip():
-                print()
+                out.append("")
             else:
                 # Wrap long lines but preserve structure
-                wrapped = textwrap.fill(line, width=66, initial_indent="   ", subsequent_indent="   ")
-                print(wrapped)
-        print("-" * 50)
+                out.append(PROMPT_LINE_WRAPPER.fill(line))
+        out.append("-" * 50)
         
         # Status
-        is_complete = decision.get('complete', False)
+        is_complete = d_get('complete', False)
         status = "✅ Complete" if is_complete else "⏳ Needs refinement"
-        print(f"📊 Status: {status}")
+        out.append(f"📊 Status: {status}")
         
         # Questions at the end (most important info last)
-        questions = decision.get('questions', [])
+        questions = d_get('questions') or []
         if questions:
-            print(f"\n❓ {Colors.BOLD}Outstanding Questions:{Colors.RESET}")
+            out.append(f"\n❓ {Colors.BOLD}Outstanding Questions:{Colors.RESET}")
             for i, question in enumerate(questions, 1):
-                wrapped = textwrap.fill(f"{i}. {question}", width=66, initial_indent="   ", subsequent_indent="      ")
-                print(wrapped)
+                out.append(QUESTION_WRAPPER.fill(f"{i}. {question}"))
+        
+        sys.stdout.write('\n'.join(out) + '\n')
+        sys.stdout.flush()
         
         # Get feedback with corrected logic
-        print(f"\n💬 {Colors.BOLD}What would you like to do?{Colors.RESET}")
-        print(f"   {Colors.GREEN}y/Y{Colors.RESET} = Accept this prompt (save and use)")
-        print(f"   {Colors.YELLOW}n/N{Colors.RESET} = Need refinement (re-consult Solution Strategist)")
-        print(f"   {Colors.RED}m/M{Colors.RESET} = Manual context only (add context without re-consulting)")
+        print("\n".join([
+            f"\n💬 {Colors.BOLD}What would you like to do?{Colors.RESET}",
+            ACCEPT_OPTION_LABEL,
+            REFINE_OPTION_LABEL,
+            MANUAL_OPTION_LABEL,
+        ]))
         
         while True:
             try:
-                response = input(f"\n{Colors.CYAN}Your choice (y/n/m): {Colors.RESET}").strip().lower()
-                if response in ['y', 'yes']:
-                    return True  # Accept prompt
-                elif response in ['n', 'no']:
-                    return 'modify'  # Re-consult Solution Strategist
-                elif response in ['m', 'modify', 'manual']:
-                    return False  # Manual context only, don't re-consult
+                response = input(FEEDBACK_CHOICE_PROMPT).strip().lower()
+                if response in FEEDBACK_CHOICES:
+                    return FEEDBACK_CHOICES[response]
                 else:
-                    print(f"{Colors.RED}❌ Please enter 'y' to accept, 'n' to refine, or 'm' for manual context{Colors.RESET}")
+                    print(FEEDBACK_CHOICE_ERROR)
             except (EOFError, KeyboardInterrupt):
-                print(f"\n{Colors.YELLOW}👋 Exiting...{Colors.RESET}")
+                print(EXITING_MESSAGE)
                 return None  # Return None to indicate cancellation
     
+    def get_draft_prompt(self, decision: Dict[str, Any]) -> str:
+        """Get the draft prompt, preferring the raw version with preserved line breaks"""
+        draft_prompt = decision.get('draft_prompt_raw')
+        if draft_prompt is None:  # Only look up the fallback when it's actually needed
+            draft_prompt = decision.get('draft_prompt')
+        if draft_prompt is None:  # Missing, or an empty 'draft_prompt:' that parsed as null
+            return 'No prompt provided'
+        if not isinstance(draft_prompt, str):  # e.g. a bare number parsed as an int
+            draft_prompt = str(draft_prompt)
+        return draft_prompt
+    
     def format_agents_for_prompt(self) -> str:
         """Format agents list for the router prompt with complete information"""
-        agents_list = []
-        for agent in self.agents:
-            if agent['id'] != 'SS01':  # Exclude the router itself
-                agents_list.append(
-                    f"- ID: {agent['id']}\n"
-                    f"  Name: {agent['name']}\n"
-                    f"  Description/Role: {agent['description']}\n"
-                    f"  Framework: {agent['framework']}\n"
-                    f"  Agent Command: {agent['agent_name']}\n"
-                    f"  Model: {agent['model']}"
-                )
-        return "\n\n".join(agents_list)
+        return "\n\n".join(self.agent_prompt_blocks)
     
     def get_scope_instructions(self, execution_scope: str) -> str:
         """Generate scope-specific instructions for the router agent"""
@@ -438,7 +687,7 @@ Focus on a comprehensive solution that addresses the problem globally while bein
     
     def call_router_agent(self, user_problem: str, execution_scope: str = 'single') -> str:
         """Call the Solution Strategist (router) agent"""
-        router_agent = next((agent for agent in self.agents if agent['id'] == 'SS01'), None)
+        router_agent = self.agents_by_id.get('SS01')
         
         if not router_agent:
             print("❌ Router agent (SS01) not found!")
@@ -449,61 +698,10 @@ Focus on a comprehensive solution that addresses the problem globally while bein
         # Add scope-specific instructions
         scope_instructions = self.get_scope_instructions(execution_scope)
         
-        # Use multiline YAML format without escaping
-        prompt = f"""CRITICAL: You are ONLY a prompt generator. You must NOT generate any solutions, code, or content. Your ONLY job is to analyze the problem and generate an optimized prompt for another agent.
-
-The user has a problem with the current project:
-"{user_problem}"
-
-EXECUTION SCOPE: {execution_scope.upper()}
-{scope_instructions}
-
-Evaluate using the framework "{router_agent['framework']}" (Reason + Act approach).
-
-I have several agents and one of them might be able to generate the solution:
-
-{agents_info}
-
-IMPORTANT: Your role is EXCLUSIVELY to:
-1. Recommend which agent should handle this task
-2. Ask clarifying questions if needed
-3. Generate an optimized prompt for that agent
-4. You must NOT provide any solutions yourself
-
-You must indicate in a structured YAML format using multiline syntax:
-- agent_id: ID of the recommended agent
-- questions: list of questions you need answered to complete the framework (if any)
-- draft_prompt: >-
-    A complete, optimized prompt for the selected agent.
-    CRITICAL: The prompt MUST start with the agent's role/persona definition.
-    Use the agent's description as their persona, then include their framework and the task.
-    Use YAML multiline format (>-) to avoid escaping quotes and special characters.
-    
-    MANDATORY FORMAT:
-    draft_prompt: >-
-      You are [AGENT_DESCRIPTION_HERE].
-      
-      Framework: [AGENT_FRAMEWORK_HERE]
-      
-      Your task is to help solve the following problem:
-      [USER_PROBLEM_DESCRIPTION]
-      
-      [Additional instructions based on the framework]
-      
-    Example:
-    draft_prompt: >-
-      You are an expert software engineer specializing in modern web development with React, Vue, and Node.js.
-      
-      Framework: Component-Based Development
-      
-      Your task is to help solve the following problem:
-      Create a responsive navigation component with mobile hamburger menu
-      
-      Please provide a complete solution following component-based architecture principles.
-- complete: true/false indicating if the prompt is complete or if questions need to be answered
-
-Wrap your YAML response between ```yaml and ``` markers. Do not include any other text outside these markers.
-"""
+        # Only the user problem varies between refinement iterations; the rest of the prompt is cached
+        prompt = ROUTER_PROMPT_HEAD + user_problem + build_router_prompt_tail(
+            execution_scope, scope_instructions, router_agent['framework'], agents_info
+        )
         
         print("🔄 Consulting Solution Strategist...")
         print()
@@ -521,25 +719,12 @@ Wrap your YAML response between ```yaml and ``` markers. Do not include any othe
         primary_model = router_agent['model']
         fallback_model = router_agent.get('fallback_model')
         
-        if agent_name == 'claude' and fallback_model:
-            # For Claude: pass both primary and fallback models in single command
-            cmd = [
-                "claude", 
-                "--model", primary_model,
-                "--fallback-model", fallback_model,
-                "-a", 
-                "-p", prompt
-            ]
-            cmd_display = f"claude --model {primary_model} --fallback-model {fallback_model} -a -p \"[PROMPT_CONTENT]\""
-        else:
-            # For other agents (gemini): use traditional single model approach
-            cmd = [
-                agent_name, 
-                "-m", primary_model,
-                "-a",
-                "-p", prompt
-            ]
-            cmd_display = f"{agent_name} -m {primary_model} -a -p \"[PROMPT_CONTENT]\""
+        # Agents with param_stdin_prompt read the prompt from stdin instead of argv (no ARG_MAX limit)
+        stdin_prompt = bool(router_agent.get('param_stdin_prompt', False))
+        prompt_bytes = prompt.encode('utf-8') if stdin_prompt else None
+        
+        cmd_prefix, cmd_display = build_agent_command_prefix(agent_name, primary_model, fallback_model, stdin_prompt)
+        cmd = list(cmd_prefix) if stdin_prompt else [*cmd_prefix, "-p", prompt]
         
         # Show command being executed with highlighted background
         highlighted_cmd = f"{Colors.BG_GRAY}{Colors.BLUE}{Colors.BOLD} {cmd_display} {Colors.RESET}"
@@ -551,119 +736,47 @@ Wrap your YAML response between ```yaml and ``` markers. Do not include any othe
         if agent_timeout is None:
             agent_timeout = DEFAULT_AGENT_TIMEOUT
             
-        counter_stop = threading.Event()
-        counter_data = {'final_time': None}  # Shared data for final time
-        counter_thread = threading.Thread(target=self.show_waiting_counter, args=(counter_stop, agent_timeout, counter_data))
-        counter_thread.start()
-            
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=agent_timeout)
-            
-            # Stop counter and get final time
-            counter_stop.set()
-            counter_thread.join()
-            
-            # Show final response time
-            if counter_data['final_time']:
-                elapsed_minutes = counter_data['final_time'] // 60
-                elapsed_seconds = counter_data['final_time'] % 60
-                if elapsed_minutes > 0:
-                    time_str = f"{elapsed_minutes}m {elapsed_seconds:02d}s"
-                else:
-                    time_str = f"{elapsed_seconds:02d}s"
-                print(f"\r✅ Agent responded in {Colors.GREEN}{Colors.BOLD}{time_str}{Colors.RESET}")
+            result = self.run_with_waiting_counter(cmd, agent_timeout, prompt_bytes, "Agent")
             
             if result.returncode != 0:
                 print(f"❌ Error calling gemini: {result.stderr}")
                 return ""
             
             # Filter out gemini CLI messages
-            output_lines = result.stdout.strip().split('\n')
-            filtered_lines = []
-            yaml_started = False
-            
-            for line in output_lines:
-                if line.strip().startswith('```yaml'):
-                    yaml_started = True
-                    filtered_lines.append(line)
-                elif line.strip().startswith('```') and yaml_started:
-                    filtered_lines.append(line)
-                    break
-                elif yaml_started:
-                    filtered_lines.append(line)
-            
-            return '\n'.join(filtered_lines)
+            return extract_yaml_block(result.stdout)
             
         except subprocess.TimeoutExpired:
-            counter_stop.set()
-            counter_thread.join()
-            print(f"\n❌ Timeout after {agent_timeout}s waiting for {router_agent.get('model', 'unknown model')} response")
+            print(f"\n❌ Timeout after {agent_timeout}s waiting for {primary_model} response")
             
             # Try fallback model if available (only for non-Claude agents, as Claude handles fallback internally)
-            fallback_model = router_agent.get('fallback_model')
             if fallback_model and agent_name != 'claude':
                 print(f"🔄 Trying fallback model: {fallback_model}")
                 
                 # Reconstruct command with fallback model
-                fallback_cmd = [
-                    router_agent['agent_name'], 
-                    '-m', fallback_model,
-                    '-a', 
-                    '-p', prompt
-                ]
+                fallback_cmd_prefix, fallback_cmd_display = build_agent_command_prefix(
+                    agent_name, fallback_model, stdin_prompt=stdin_prompt
+                )
+                fallback_cmd = list(fallback_cmd_prefix) if stdin_prompt else [*fallback_cmd_prefix, '-p', prompt]
                 
                 # Show fallback command
-                fallback_cmd_display = f"{router_agent['agent_name']} -m {fallback_model} -a -p \"[PROMPT_CONTENT]\""
                 highlighted_fallback_cmd = f"{Colors.BG_GRAY}{Colors.YELLOW}{Colors.BOLD} {fallback_cmd_display} {Colors.RESET}"
                 print(f"🔄 Fallback Command: {highlighted_fallback_cmd}")
                 
-                # Start new counter for fallback
-                fallback_counter_stop = threading.Event()
-                fallback_counter_data = {'final_time': None}
-                fallback_counter_thread = threading.Thread(target=self.show_waiting_counter, args=(fallback_counter_stop, agent_timeout, fallback_counter_data))
-                fallback_counter_thread.start()
-                
                 try:
-                    fallback_result = subprocess.run(fallback_cmd, capture_output=True, text=True, timeout=agent_timeout)
-                    
-                    # Stop fallback counter and show time
-                    fallback_counter_stop.set()
-                    fallback_counter_thread.join()
-                    
-                    if fallback_counter_data['final_time']:
-                        elapsed_minutes = fallback_counter_data['final_time'] // 60
-                        elapsed_seconds = fallback_counter_data['final_time'] % 60
-                        if elapsed_minutes > 0:
-                            time_str = f"{elapsed_minutes}m {elapsed_seconds:02d}s"
-                        else:
-                            time_str = f"{elapsed_seconds:02d}s"
-                        print(f"\r✅ Fallback model responded in {Colors.GREEN}{Colors.BOLD}{time_str}{Colors.RESET}")
+                    fallback_result = self.run_with_waiting_counter(fallback_cmd, agent_timeout, prompt_bytes, "Fallback model")
                     
                     if fallback_result.returncode != 0:
                         print(f"❌ Error calling fallback model: {fallback_result.stderr}")
                         return ""
                     
                     # Filter fallback output the same way
-                    fallback_output_lines = fallback_result.stdout.strip().split('\n')
-                    fallback_filtered_lines = []
-                    fallback_yaml_started = False
-                    
-                    for line in fallback_output_lines:
-                        if 'agent_id:' in line.lower() or 'draft_prompt:' in line.lower():
-                            fallback_yaml_started = True
-                        elif fallback_yaml_started:
-                            fallback_filtered_lines.append(line)
-                    
-                    return '\n'.join(fallback_filtered_lines)
+                    return extract_yaml_block(fallback_result.stdout)
                     
                 except subprocess.TimeoutExpired:
-                    fallback_counter_stop.set()
-                    fallback_counter_thread.join()
                     print(f"❌ Fallback model {fallback_model} also timed out after {agent_timeout}s")
                     return ""
                 except Exception as e:
-                    fallback_counter_stop.set()
-                    fallback_counter_thread.join()
                     print(f"❌ Error calling fallback model: {e}")
                     return ""
             elif agent_name == 'claude':
@@ -673,16 +786,31 @@ Wrap your YAML response between ```yaml and ``` markers. Do not include any othe
                 print("⚠️  No fallback model configured")
                 return ""
         except FileNotFoundError:
-            counter_stop.set()
-            counter_thread.join()
             print(f"❌ '{agent_name}' command not found. Please install {agent_name} CLI.")
             return ""
         except Exception as e:
-            counter_stop.set()
-            counter_thread.join()
             print(f"❌ Error calling {agent_name}: {e}")
             return ""
     
+    def run_with_waiting_counter(self, cmd: List[str], timeout: int, input_bytes: bytes = None,
+                                 label: str = "Agent") -> subprocess.CompletedProcess:
+        """Run an agent command with the waiting counter shown, then report how long it took"""
+        counter_stop = threading.Event()
+        counter_data = {'final_time': None}  # Shared data for final time
+        counter_thread = threading.Thread(target=self.show_waiting_counter, args=(counter_stop, timeout, counter_data))
+        counter_thread.start()
+        try:
+            result = run_agent_command(cmd, timeout, input_bytes)
+        finally:
+            # Stop counter and get final time, whether the command finished, timed out or failed
+            counter_stop.set()
+            counter_thread.join()
+        
+        # Show final response time
+        if counter_data['final_time']:
+            print(f"\r✅ {label} responded in {Colors.GREEN}{Colors.BOLD}{format_elapsed(counter_data['final_time'])}{Colors.RESET}")
+        return result
+    
     def parse_router_response(self, response: str) -> Dict[str, Any]:
         """Parse the YAML response from the router"""
         try:
@@ -696,7 +824,7 @@ Wrap your YAML response between ```yaml and ``` markers. Do not include any othe
             yaml_content = response[yaml_start + 7:yaml_end].strip()
             
             # Parse YAML but also extract raw draft_prompt to preserve formatting
-            parsed = yaml.safe_load(yaml_content)
+            parsed = yaml.load(yaml_content, Loader=YAML_LOADER)
             
             # Extract the raw draft_prompt with preserved line breaks
             if parsed and 'draft_prompt' in parsed:
@@ -708,19 +836,12 @@ Wrap your YAML response between ```yaml and ``` markers. Do not include any othe
                     if content_start != -1:
                         content_start = yaml_content.find('\n', content_start) + 1
                         
-                        # Find the end (next YAML key or end of content)
+                        # Find the end (next YAML key or end of content):
+                        # a non-empty line that doesn't start with spaces is a new YAML key
                         lines = yaml_content[content_start:].split('\n')
-                        prompt_lines = []
-                        
-                        for line in lines:
-                            # If line doesn't start with spaces, it's a new YAML key
-                            if line.strip() and not line.startswith('  '):
-                                break
-                            # Remove the indentation (first 2 spaces) and add to prompt
-                            if line.startswith('  '):
-                                prompt_lines.append(line[2:])
-                            elif not line.strip():  # Empty line
-                                prompt_lines.append('')
+                        block_lines = takewhile(lambda line: line.startswith('  ') or not line.strip(), lines)
+                        # Remove the indentation (first 2 spaces); empty lines stay empty
+                        prompt_lines = [line[2:] if line.startswith('  ') else '' for line in block_lines]
                         
                         # Join with actual line breaks
                         raw_prompt = '\n'.join(prompt_lines).strip()
@@ -752,23 +873,24 @@ Wrap your YAML response between ```yaml and ``` markers. Do not include any othe
     
     def get_additional_feedback_with_context(self) -> str:
         """Get additional feedback from user with better guidance and enhanced text wrapping"""
-        print(f"\n{Colors.YELLOW}💡 REFINEMENT GUIDANCE{Colors.RESET}")
-        print("What you provide here will be ADDED to your original problem.")
-        print("You can:")
-        print("  • Add new requirements or constraints")
-        print("  • Clarify existing requirements") 
-        print("  • Specify what you didn't like about the current solution")
-        print("  • Request different approaches or technologies")
-        print("")
-        print("Examples:")
-        print("  - 'Make it more mobile-friendly'")
-        print("  - 'Use hash routing instead of path routing'")
-        print("  - 'Add error handling for network failures'")
-        print("  - 'Focus more on performance optimization'")
-        print("")
-        
+        print("\n".join([
+            f"\n{Colors.YELLOW}💡 REFINEMENT GUIDANCE{Colors.RESET}",
+            "What you provide here will be ADDED to your original problem.",
+            "You can:",
+            "  • Add new requirements or constraints",
+            "  • Clarify existing requirements",
+            "  • Specify what you didn't like about the current solution",
+            "  • Request different approaches or technologies",
+            "",
+            "Examples:",
+            "  - 'Make it more mobile-friendly'",
+            "  - 'Use hash routing instead of path routing'",
+            "  - 'Add error handling for network failures'",
+            "  - 'Focus more on performance optimization'",
+            "",
+            f"{Colors.DIM}🔧 Configuring text input for optimal wrapping...{Colors.RESET}",
+        ]))
         # Force readline reconfiguration specifically for iteration feedback
-        print(f"{Colors.DIM}🔧 Configuring text input for optimal wrapping...{Colors.RESET}")
         self.configure_readline_for_input()
         
         return self.get_multiline_input("📝 What refinements do you want to add?")
@@ -782,10 +904,10 @@ Wrap your YAML response between ```yaml and ``` markers. Do not include any othe
         
         # Ask for confirmation
         while True:
-            choice = input(f"\n{Colors.CYAN}Proceed with this input? (y/n): {Colors.RESET}").lower().strip()
-            if choice in ['y', 'yes', '']:
+            choice = input(PROCEED_PROMPT).lower().strip()
+            if choice in YES_OR_DEFAULT_ANSWERS:
                 return True
-            elif choice in ['n', 'no']:
+            elif choice in NO_ANSWERS:
                 print("❌ Operation cancelled.")
                 return False
             else:
@@ -793,47 +915,45 @@ Wrap your YAML response between ```yaml and ``` markers. Do not include any othe
     
     def get_execution_scope(self) -> str:
         """Ask user about execution scope: single vs per-unit"""
-        print(f"\n{Colors.BOLD}🎯 EXECUTION SCOPE{Colors.RESET}")
-        print("Will this solution be applied once to the entire project, or should it")
-        print("be executed individually for each unit of the book?")
-        print("")
-        print("Examples:")
-        print("• Single execution: Global routing system, main CSS changes, index.html updates")
-        print("• Per-unit execution: Unit-specific content fixes, individual page improvements")
-        print("")
-        print(f"{Colors.GREEN}s{Colors.RESET} = Single execution (entire project)")
-        print(f"{Colors.YELLOW}u{Colors.RESET} = Per-unit execution (template with Unit X placeholder)")
+        print("\n".join([
+            f"\n{Colors.BOLD}🎯 EXECUTION SCOPE{Colors.RESET}",
+            "Will this solution be applied once to the entire project, or should it",
+            "be executed individually for each unit of the book?",
+            "",
+            "Examples:",
+            "• Single execution: Global routing system, main CSS changes, index.html updates",
+            "• Per-unit execution: Unit-specific content fixes, individual page improvements",
+            "",
+            SINGLE_SCOPE_LABEL,
+            PER_UNIT_SCOPE_LABEL,
+        ]))
         
         while True:
             try:
-                choice = input(f"\n{Colors.CYAN}Execution scope (s/u): {Colors.RESET}").strip().lower()
-                if choice in ['s', 'single']:
+                choice = input(EXECUTION_SCOPE_PROMPT).strip().lower()
+                if choice in SCOPE_SINGLE_ANSWERS:
                     return 'single'
-                elif choice in ['u', 'unit', 'per-unit']:
+                elif choice in SCOPE_UNIT_ANSWERS:
                     return 'per-unit'
                 else:
-                    print(f"{Colors.RED}❌ Please enter 's' for single or 'u' for per-unit execution{Colors.RESET}")
+                    print(EXECUTION_SCOPE_ERROR)
             except (EOFError, KeyboardInterrupt):
-                print(f"\n{Colors.YELLOW}👋 Exiting...{Colors.RESET}")
+                print(EXITING_MESSAGE)
                 return None
     
     def show_waiting_counter(self, stop_event: threading.Event, timeout_seconds: int = 60, counter_data: Dict = None):
         """Show a visual counter while waiting for agent response with timeout display"""
-        start_time = time.time()
+        # Monotonic clock so NTP adjustments can't make the counter jump; integer ns avoids float math
+        start_ns = time.monotonic_ns()
         last_message_length = 0
         
         while not stop_event.is_set():
-            elapsed = int(time.time() - start_time)
+            elapsed = (time.monotonic_ns() - start_ns) // 1_000_000_000
             remaining = max(0, timeout_seconds - elapsed)
-            minutes = elapsed // 60
-            seconds = elapsed % 60
             
             # Create animated waiting message
             dots = '.' * ((elapsed % 3) + 1)
-            if minutes > 0:
-                time_str = f"{minutes}m {seconds:02d}s"
-            else:
-                time_str = f"{seconds:02d}s"
+            time_str = format_elapsed(elapsed)
             
             # Show timeout information
             remaining_minutes = remaining // 60
@@ -854,7 +974,7 @@ Wrap your YAML response between ```yaml and ``` markers. Do not include any othe
             time.sleep(1)
         
         # Store final elapsed time for caller to use
-        final_elapsed = int(time.time() - start_time)
+        final_elapsed = (time.monotonic_ns() - start_ns) // 1_000_000_000
         if counter_data is not None:
             counter_data['final_time'] = final_elapsed
     
@@ -865,14 +985,12 @@ Wrap your YAML response between ```yaml and ``` markers. Do not include any othe
     def show_final_message(self, satisfied: bool, prompt_id: str):
         """Show final success/completion message"""
         print("\n" + "="*70)
+        print("✅ PROMPT GENERATED SUCCESSFULLY!" if satisfied else "🔄 PROMPT SAVED FOR REFINEMENT")
+        print(f"📁 Prompt saved with ID: {prompt_id}")
         if satisfied:
-            print("✅ PROMPT GENERATED SUCCESSFULLY!")
-            print(f"📁 Prompt saved with ID: {prompt_id}")
-            print(f"📂 Location: src/conf/agent_prompts.yaml")
+            print("📂 Location: src/conf/agent_prompts.yaml")
         else:
-            print("🔄 PROMPT SAVED FOR REFINEMENT")
-            print(f"📁 Prompt saved with ID: {prompt_id}")
-            print(f"📂 Status: needs_refinement in src/conf/agent_prompts.yaml")
+            print("📂 Status: needs_refinement in src/conf/agent_prompts.yaml")
         print("="*70)
     
     def run(self):
@@ -984,13 +1102,7 @@ Wrap your YAML response between ```yaml and ``` markers. Do not include any othe
         except Exception as e:
             print(f"\n❌ Unexpected error: {e}")
             print("\n🔍 Stack trace (last 3 calls from our code):")
-            import traceback
-            tb_lines = traceback.format_exc().split('\n')
-            # Filter for lines that contain our code (not system/library code)
-            our_code_lines = [line for line in tb_lines if 'agent_router' in line or 'learn-cloud' in line]
-            for line in our_code_lines[-6:]:  # Show last 6 relevant lines
-                if line.strip():
-                    print(f"    {line}")
+            print_our_traceback()
 
 def main():
     """Entry point"""
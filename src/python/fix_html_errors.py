@@ -5,6 +5,25 @@ import html
 from pathlib import Path
 from typing import Tuple, Dict, Callable
 
+# Rule patterns, compiled once at import
+SELF_CLOSING_SLASHES = re.compile(r'/\s*/>')
+BUTTON_WITHOUT_TYPE = re.compile(r'(<button(?![^>]*type=)([^>]*?)>)', re.IGNORECASE)
+ICON_BUTTON_WITHOUT_LABEL = re.compile(
+    r'<button((?![^>]*aria-label=)[^>]*?)>\s*'
+    r'<i\s+class="bi\s+bi-([a-zA-Z0-9-]+)"[^>]*></i>\s*'
+    r'</button>',
+    re.IGNORECASE | re.DOTALL
+)
+TITLE_ATTRIBUTE = re.compile(r'\s*title="([^"]*)"')
+HEADER_WITHOUT_LABEL = re.compile(
+    r'<header((?![^>]*aria-label=)(?![^>]*aria-labelledby=)[^>]*)>',
+    re.IGNORECASE | re.MULTILINE
+)
+PROTECTED_BLOCK = re.compile(r'(<(?:code|script|pre)[^>]*>.*?</(?:code|script|pre)>)', re.DOTALL | re.IGNORECASE)
+RAW_AMPERSAND = re.compile(r'&(?![a-zA-Z0-9#]+;)')
+DIV_OPEN = re.compile(r'<div[^>]*>', re.IGNORECASE)
+DIV_CLOSE = re.compile(r'</div>', re.IGNORECASE)
+
 class HTMLFixer:
     def __init__(self):
         self.changes_made = False
@@ -31,32 +50,20 @@ class HTMLFixer:
     
     def _fix_self_closing_tags(self, content: str) -> str:
         """Fix 1: Replace '/ />' with '/>'"""
-        fixed = re.sub(r'/\s*/>', '/>', content)
+        fixed = SELF_CLOSING_SLASHES.sub('/>', content)
         if fixed != content:
             self._log_fix("Replaced '/ />' with '/>'")
         return fixed
     
     def _fix_button_types(self, content: str) -> str:
         """Fix 2: Add type='button' to buttons without type"""
-        fixed = re.sub(
-            r'(<button(?![^>]*type=)([^>]*?)>)',
-            r'<button type="button"\2>',
-            content,
-            flags=re.IGNORECASE
-        )
+        fixed = BUTTON_WITHOUT_TYPE.sub(r'<button type="button"\2>', content)
         if fixed != content:
             self._log_fix("Added type=\"button\" to <button> tags")
         return fixed
     
     def _fix_icon_button_aria_labels(self, content: str) -> str:
         """Fix 3: Add aria-label to iconic buttons"""
-        pattern = re.compile(
-            r'<button((?![^>]*aria-label=)[^>]*?)>\s*'
-            r'<i\s+class="bi\s+bi-([a-zA-Z0-9-]+)"[^>]*></i>\s*'
-            r'</button>',
-            re.IGNORECASE | re.DOTALL
-        )
-        
         def replacer(match):
             button_attrs, icon_class = match.groups()
             
@@ -65,18 +72,18 @@ class HTMLFixer:
             encoded_label = html.escape(label, quote=True)
             
             # Limpiar title existente si lo hay
-            clean_attrs = re.sub(r'\s*title="[^"]*"', '', button_attrs)
+            clean_attrs = TITLE_ATTRIBUTE.sub('', button_attrs)
             
             self._log_fix(f'Added aria-label="{encoded_label}" to button with icon bi-{icon_class}')
             
             return f'<button{clean_attrs} aria-label="{encoded_label}"><i class="bi bi-{icon_class}"></i></button>'
         
-        return pattern.sub(replacer, content)
+        return ICON_BUTTON_WITHOUT_LABEL.sub(replacer, content)
     
     def _get_icon_label(self, icon_class: str, button_attrs: str) -> str:
         """Obtener label para un icono específico"""
         # Primero verificar si hay un title existente
-        title_match = re.search(r'title="([^"]*)"', button_attrs)
+        title_match = TITLE_ATTRIBUTE.search(button_attrs)
         if title_match:
             return title_match.group(1)
         
@@ -88,12 +95,7 @@ class HTMLFixer:
     
     def _fix_header_aria_labels(self, content: str) -> str:
         """Fix 4: Add aria-label to headers without accessible names"""
-        fixed = re.sub(
-            r'<header((?![^>]*aria-label=)(?![^>]*aria-labelledby=)[^>]*)>',
-            r'<header\1 aria-label="Header">',
-            content,
-            flags=re.IGNORECASE | re.MULTILINE
-        )
+        fixed = HEADER_WITHOUT_LABEL.sub(r'<header\1 aria-label="Header">', content)
         if fixed != content:
             self._log_fix("Added aria-label=\"Header\" to <header> tags")
         return fixed
@@ -104,9 +106,6 @@ class HTMLFixer:
         protected_blocks = []
         protected_content = content
         
-        # Pattern to match code, script, and pre blocks
-        protection_pattern = r'(<(?:code|script|pre)[^>]*>.*?</(?:code|script|pre)>)'
-        
         def protect_block(match):
             block = match.group(1)
             placeholder = f"__PROTECTED_BLOCK_{len(protected_blocks)}__"
@@ -114,10 +113,10 @@ class HTMLFixer:
             return placeholder
         
         # Replace protected blocks with placeholders
-        protected_content = re.sub(protection_pattern, protect_block, protected_content, flags=re.DOTALL | re.IGNORECASE)
+        protected_content = PROTECTED_BLOCK.sub(protect_block, protected_content)
         
         # Fix & characters in the remaining content
-        fixed_content = re.sub(r'&(?![a-zA-Z0-9#]+;)', '&amp;', protected_content)
+        fixed_content = RAW_AMPERSAND.sub('&amp;', protected_content)
         
         # Restore protected blocks
         for i, block in enumerate(protected_blocks):
@@ -137,9 +136,14 @@ class HTMLFixer:
         for line_num, line in enumerate(lines):
             original_line = line
             
+            # Most lines have no div tags at all; a plain substring check is much cheaper than two regex scans
+            if 'div' not in line.lower():
+                fixed_lines.append(line)
+                continue
+            
             # Count opening and closing div tags in this line
-            opening_divs = len(re.findall(r'<div[^>]*>', line, re.IGNORECASE))
-            closing_divs = len(re.findall(r'</div>', line, re.IGNORECASE))
+            opening_divs = len(DIV_OPEN.findall(line))
+            closing_divs = len(DIV_CLOSE.findall(line))
             
             # Update div stack
             for _ in range(opening_divs):
@@ -154,7 +158,7 @@ class HTMLFixer:
                 # Replace excess </div> tags with empty string
                 fixed_line = line
                 for _ in range(excess_closings):
-                    fixed_line = re.sub(r'</div>', '', fixed_line, count=1, flags=re.IGNORECASE)
+                    fixed_line = DIV_CLOSE.sub('', fixed_line, count=1)
                 
                 if fixed_line != line:
                     self._log_fix(f"Removed {excess_closings} stray </div> tag(s) from line {line_num + 1}")